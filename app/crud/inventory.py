@@ -18,6 +18,14 @@ from app.schemas.inventory import PurchaseCreate, InventoryItemCreate, Inventory
 
 logger = logging.getLogger(__name__)
 
+KG_PRECISION = Decimal('0.001')  # 3 decimal precision
+
+def _as_decimal(value) -> Decimal:
+    """Numeric columns already come back as Decimal; only convert other types."""
+    if isinstance(value, Decimal):
+        return value
+    return Decimal(str(value))
+
 class CRUDInventoryItem(CRUDBase[InventoryItem]):
     def __init__(self):
         super().__init__(InventoryItem)
@@ -118,11 +126,27 @@ class CRUDInventoryLedger(CRUDBase[InventoryLedger]):
             )
             result = db.execute(stmt)
             stock = result.scalar_one()
-            return Decimal(str(stock)).quantize(Decimal('0.001'))  # 3 decimal precision
+            return _as_decimal(stock).quantize(KG_PRECISION)
         except SQLAlchemyError as e:
             logger.error(f"Error calculating stock for item {item_id}: {e}")
             return Decimal('0')
     
+    def get_stock_by_item(self, db: Session) -> Dict[int, Decimal]:
+        """Calculate current stock for all items in one grouped query (item_id -> kg)"""
+        try:
+            stmt = (
+                select(InventoryLedger.item_id, func.coalesce(func.sum(InventoryLedger.kg_change), 0))
+                .group_by(InventoryLedger.item_id)
+            )
+            result = db.execute(stmt)
+            return {
+                item_id: _as_decimal(stock).quantize(KG_PRECISION)
+                for item_id, stock in result
+            }
+        except SQLAlchemyError as e:
+            logger.error(f"Error calculating stock levels: {e}")
+            return {}
+    
     def get_item_ledger(self, db: Session, item_id: int, *, skip: int = 0, limit: int = 100) -> List[InventoryLedger]:
         """Get ledger entries for specific item"""
         try:
@@ -12,6 +12,8 @@ from sqlalchemy import create_engine, text
 from sqlalchemy.exc import OperationalError, SQLAlchemyError
 from sqlalchemy.orm import sessionmaker, declarative_base, scoped_session
 from sqlalchemy.pool import QueuePool
+from decimal import Decimal
+import orjson
 import os
 from dotenv import load_dotenv
 import logging
@@ -48,6 +50,16 @@ if "supabase" in DATABASE_URL and "sslmode" not in DATABASE_URL:
 
 logger.info(f"Database URL configured (driver: {'psycopg3' if 'psycopg' in DATABASE_URL else 'other'})")
 
+def _json_default(obj):
+    """Serialize values orjson has no native support for (Numeric -> Decimal)."""
+    if isinstance(obj, Decimal):
+        return float(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+def json_serializer(obj) -> str:
+    """JSONB serializer: orjson handles datetime natively and is much faster than stdlib json."""
+    return orjson.dumps(obj, default=_json_default).decode()
+
 # Create engine with contract requirements
 engine = create_engine(
     DATABASE_URL,
@@ -59,6 +71,8 @@ engine = create_engine(
     pool_recycle=300,
     pool_timeout=30,
     echo=False,
+    json_serializer=json_serializer,
+    json_deserializer=orjson.loads,
     connect_args={
         "connect_timeout": 10,
         "keepalives": 1,
@@ -15,6 +15,8 @@ import logging
 from app.database import engine, get_db, test_connection
 from app import models
 from app.routers import auth, inventory
+from app.utils.audit import audit_writer
+from app.utils.compression import SkipCompressedGZipMiddleware
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -38,17 +40,31 @@ async def lifespan(app: FastAPI):
     else:
         logger.info(f"Preflight test passed: {message}")
     
-    # Create tables if they don't exist
-    try:
-        models.Base.metadata.create_all(bind=engine)
-        logger.info("✅ Database tables verified")
-    except Exception as e:
-        logger.warning(f"⚠️ Database table creation: {e}")
+    # Create tables only when asked to (one-shot release step), so every
+    # worker doesn't run schema DDL on boot
+    if os.getenv("RUN_DB_INIT") == "1":
+        try:
+            models.Base.metadata.create_all(bind=engine)
+            logger.info("✅ Database tables verified")
+        except Exception as e:
+            logger.warning(f"⚠️ Database table creation: {e}")
+    else:
+        logger.info("Skipping database table creation (set RUN_DB_INIT=1 to create tables on startup)")
+    
+    # Write audit logs off the request path
+    audit_writer.start()
     
     yield
     
     # Shutdown
     logger.info("👋 Shutting down Nangulu POS")
+    
+    # Flush queued audit logs before exit
+    audit_writer.stop()
+    
+    # Stop PDF report worker processes (lazy import, like the routers)
+    from app.utils.pdf_reports import shutdown_process_pool
+    shutdown_process_pool()
 
 # Create FastAPI app
 app = FastAPI(
@@ -69,6 +85,10 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Gzip responses over 1KB (JSON dashboards/lists); PDFs are already
+# Flate-compressed, so they pass through uncompressed
+app.add_middleware(SkipCompressedGZipMiddleware, minimum_size=1024)
+
 # Include routers
 app.include_router(auth.router, prefix="/api")
 app.include_router(inventory.router, prefix="/api")
@@ -2,7 +2,7 @@
 SQLAlchemy 2.x models with proper patterns.
 Contract: Use only 2.x syntax, avoid mixing v1 patterns.
 """
-from sqlalchemy import Column, Integer, String, Numeric, Boolean, DateTime, ForeignKey, Text
+from sqlalchemy import Column, Integer, String, Numeric, Boolean, DateTime, ForeignKey, Text, Index, text
 from sqlalchemy.dialects.postgresql import JSONB, INET
 from sqlalchemy.orm import relationship, declarative_base
 from sqlalchemy.sql import func
@@ -66,6 +66,13 @@ class Sale(Base):
     item = relationship("InventoryItem", back_populates="sales")
     cashier = relationship("User", back_populates="sales_as_cashier")
     reversal = relationship("SaleReversal", uselist=False, back_populates="sale")
+    
+    # Indexes for alert/snapshot/archive filters on (created_at, status)
+    # (existing databases: apply migrations/add_indexes.sql)
+    __table_args__ = (
+        Index("ix_sales_created_status", "created_at", "status"),
+        Index("ix_sales_active_created_at", "created_at", postgresql_where=text("status = 'ACTIVE'")),
+    )
 
 class SaleReversal(Base):
     __tablename__ = "sale_reversals"
@@ -95,6 +102,13 @@ class InventoryLedger(Base):
     # Relationships
     item = relationship("InventoryItem", back_populates="ledger_entries")
     creator_rel = relationship("User", back_populates="ledger_entries")
+    
+    # Indexes for per-item stock sums and ledger activity summaries
+    # (existing databases: apply migrations/add_indexes.sql)
+    __table_args__ = (
+        Index("ix_ledger_item_id", "item_id"),
+        Index("ix_ledger_created_at", "created_at"),
+    )
 
 class AuditLog(Base):
     __tablename__ = "audit_logs"
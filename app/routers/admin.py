@@ -9,6 +9,7 @@ from sqlalchemy import text, select, func, and_
 from datetime import date, datetime, timedelta
 from typing import List, Optional
 from decimal import Decimal
+import io
 
 from app.database import get_db
 from app.auth import get_current_user
@@ -353,16 +354,22 @@ def generate_stock_pdf_report(
     Contract: Simple report export functionality.
     """
     try:
-        from app.utils.pdf_reports import pdf_generator
-        
-        # Get stock data (reuse dashboard logic)
-        stmt = select(InventoryItem).where(InventoryItem.is_active == True)
-        result = db.execute(stmt)
-        items = result.scalars().all()
-        
-        stock_data = []
+        from app.utils.pdf_reports import PDFReportGenerator, StockRow, render_report
+        
+        # Get stock data as plain rows (reuse dashboard logic)
+        stmt = select(
+            InventoryItem.id,
+            InventoryItem.name,
+            InventoryItem.current_price_per_kg,
+            InventoryItem.low_stock_level,
+            InventoryItem.critical_stock_level
+        ).where(InventoryItem.is_active == True)
+        items = db.execute(stmt).all()
+        stock_map = crud_inventory_ledger.get_stock_by_item(db)
+        
+        stock_data: List[StockRow] = []
         for item in items:
-            current_stock = crud_inventory_ledger.get_item_stock(db, item.id)
+            current_stock = stock_map.get(item.id, Decimal('0.000'))
             
             # Determine stock status
             if current_stock <= item.critical_stock_level:
@@ -386,15 +393,16 @@ def generate_stock_pdf_report(
             })
         
         # Generate PDF
-        pdf_bytes = pdf_generator.generate_stock_report(
+        pdf_buffer = render_report(
+            PDFReportGenerator.generate_stock_report,
             stock_data,
-            report_title="Nangulu POS - Stock Report"
+            "Nangulu POS - Stock Report"
         )
         
         # Return PDF as download
         from fastapi.responses import StreamingResponse
         return StreamingResponse(
-            io.BytesIO(pdf_bytes),
+            pdf_buffer,
             media_type="application/pdf",
             headers={
                 "Content-Disposition": f"attachment; filename=stock_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf"
@@ -423,12 +431,21 @@ def generate_sales_pdf_report(
     Generate PDF sales report for date range.
     """
     try:
-        from app.utils.pdf_reports import pdf_generator
-        import io
+        from app.utils.pdf_reports import PDFReportGenerator, SalesRow, render_report
         
-        # Get sales data
+        # Get sales data as plain joined rows (no ORM objects or per-sale
+        # relationship loads for item/cashier names)
         stmt = (
-            select(Sale)
+            select(
+                Sale.sale_number,
+                Sale.created_at,
+                InventoryItem.name.label("item_name"),
+                Sale.kg_sold,
+                Sale.price_per_kg_snapshot,
+                Sale.total_price,
+                User.full_name.label("cashier_name"),
+                Sale.customer_name
+            )
             .join(InventoryItem, Sale.item_id == InventoryItem.id)
             .join(User, Sale.cashier_id == User.id)
             .where(
@@ -441,21 +458,19 @@ def generate_sales_pdf_report(
             .order_by(Sale.created_at.desc())
         )
         
-        result = db.execute(stmt)
-        sales = result.scalars().all()
-        
-        sales_data = []
-        for sale in sales:
-            sales_data.append({
-                "sale_number": sale.sale_number,
-                "created_at": sale.created_at.isoformat() if sale.created_at else "",
-                "item_name": sale.item.name,
-                "kg_sold": float(sale.kg_sold),
-                "price_per_kg_snapshot": float(sale.price_per_kg_snapshot),
-                "total_price": float(sale.total_price) if sale.total_price else 0,
-                "cashier_name": sale.cashier.full_name,
-                "customer_name": sale.customer_name
-            })
+        sales_data: List[SalesRow] = [
+            {
+                "sale_number": row.sale_number,
+                "created_at": row.created_at.isoformat() if row.created_at else "",
+                "item_name": row.item_name,
+                "kg_sold": float(row.kg_sold),
+                "price_per_kg_snapshot": float(row.price_per_kg_snapshot),
+                "total_price": float(row.total_price) if row.total_price else 0,
+                "cashier_name": row.cashier_name,
+                "customer_name": row.customer_name
+            }
+            for row in db.execute(stmt)
+        ]
         
         # Date range description
         if start_date == end_date:
@@ -464,12 +479,12 @@ def generate_sales_pdf_report(
             date_range = f"Period: {start_date} to {end_date}"
         
         # Generate PDF
-        pdf_bytes = pdf_generator.generate_sales_report(sales_data, date_range)
+        pdf_buffer = render_report(PDFReportGenerator.generate_sales_report, sales_data, date_range)
         
         # Return PDF as download
         from fastapi.responses import StreamingResponse
         return StreamingResponse(
-            io.BytesIO(pdf_bytes),
+            pdf_buffer,
             media_type="application/pdf",
             headers={
                 "Content-Disposition": f"attachment; filename=sales_report_{start_date}_{end_date}.pdf"
@@ -497,7 +512,6 @@ def generate_performance_pdf_report(
     """
     try:
         from app.utils.pdf_reports import pdf_generator
-        import io
         
         # Get performance data from view
         query = text("SELECT * FROM cashier_performance ORDER BY total_revenue DESC")
@@ -519,15 +533,18 @@ def generate_performance_pdf_report(
         # This would be expanded to create a comprehensive performance report
         # For now, return a simple placeholder
         
-        pdf_bytes = pdf_generator.generate_stock_report(
+        pdf_buffer = io.BytesIO()
+        pdf_generator.generate_stock_report(
             [{"name": "Performance Report", "current_stock": 0, "current_price_per_kg": 0, 
               "stock_status": "INFO", "stock_value": 0}],
-            report_title="Performance Report - Coming Soon"
+            report_title="Performance Report - Coming Soon",
+            output=pdf_buffer
         )
+        pdf_buffer.seek(0)
         
         from fastapi.responses import StreamingResponse
         return StreamingResponse(
-            io.BytesIO(pdf_bytes),
+            pdf_buffer,
             media_type="application/pdf",
             headers={
                 "Content-Disposition": f"attachment; filename=performance_report_{datetime.now().strftime('%Y%m%d')}.pdf"
@@ -550,16 +567,22 @@ def generate_stock_pdf_report(
     Contract: Simple report export functionality.
     """
     try:
-        from app.utils.pdf_reports import pdf_generator
-        
-        # Get stock data (reuse dashboard logic)
-        stmt = select(InventoryItem).where(InventoryItem.is_active == True)
-        result = db.execute(stmt)
-        items = result.scalars().all()
-        
-        stock_data = []
+        from app.utils.pdf_reports import PDFReportGenerator, StockRow, render_report
+        
+        # Get stock data as plain rows (reuse dashboard logic)
+        stmt = select(
+            InventoryItem.id,
+            InventoryItem.name,
+            InventoryItem.current_price_per_kg,
+            InventoryItem.low_stock_level,
+            InventoryItem.critical_stock_level
+        ).where(InventoryItem.is_active == True)
+        items = db.execute(stmt).all()
+        stock_map = crud_inventory_ledger.get_stock_by_item(db)
+        
+        stock_data: List[StockRow] = []
         for item in items:
-            current_stock = crud_inventory_ledger.get_item_stock(db, item.id)
+            current_stock = stock_map.get(item.id, Decimal('0.000'))
             
             # Determine stock status
             if current_stock <= item.critical_stock_level:
@@ -583,15 +606,16 @@ def generate_stock_pdf_report(
             })
         
         # Generate PDF
-        pdf_bytes = pdf_generator.generate_stock_report(
+        pdf_buffer = render_report(
+            PDFReportGenerator.generate_stock_report,
             stock_data,
-            report_title="Nangulu POS - Stock Report"
+            "Nangulu POS - Stock Report"
         )
         
         # Return PDF as download
         from fastapi.responses import StreamingResponse
         return StreamingResponse(
-            io.BytesIO(pdf_bytes),
+            pdf_buffer,
             media_type="application/pdf",
             headers={
                 "Content-Disposition": f"attachment; filename=stock_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf"
@@ -620,12 +644,21 @@ def generate_sales_pdf_report(
     Generate PDF sales report for date range.
     """
     try:
-        from app.utils.pdf_reports import pdf_generator
-        import io
+        from app.utils.pdf_reports import PDFReportGenerator, SalesRow, render_report
         
-        # Get sales data
+        # Get sales data as plain joined rows (no ORM objects or per-sale
+        # relationship loads for item/cashier names)
         stmt = (
-            select(Sale)
+            select(
+                Sale.sale_number,
+                Sale.created_at,
+                InventoryItem.name.label("item_name"),
+                Sale.kg_sold,
+                Sale.price_per_kg_snapshot,
+                Sale.total_price,
+                User.full_name.label("cashier_name"),
+                Sale.customer_name
+            )
             .join(InventoryItem, Sale.item_id == InventoryItem.id)
             .join(User, Sale.cashier_id == User.id)
             .where(
@@ -638,21 +671,19 @@ def generate_sales_pdf_report(
             .order_by(Sale.created_at.desc())
         )
         
-        result = db.execute(stmt)
-        sales = result.scalars().all()
-        
-        sales_data = []
-        for sale in sales:
-            sales_data.append({
-                "sale_number": sale.sale_number,
-                "created_at": sale.created_at.isoformat() if sale.created_at else "",
-                "item_name": sale.item.name,
-                "kg_sold": float(sale.kg_sold),
-                "price_per_kg_snapshot": float(sale.price_per_kg_snapshot),
-                "total_price": float(sale.total_price) if sale.total_price else 0,
-                "cashier_name": sale.cashier.full_name,
-                "customer_name": sale.customer_name
-            })
+        sales_data: List[SalesRow] = [
+            {
+                "sale_number": row.sale_number,
+                "created_at": row.created_at.isoformat() if row.created_at else "",
+                "item_name": row.item_name,
+                "kg_sold": float(row.kg_sold),
+                "price_per_kg_snapshot": float(row.price_per_kg_snapshot),
+                "total_price": float(row.total_price) if row.total_price else 0,
+                "cashier_name": row.cashier_name,
+                "customer_name": row.customer_name
+            }
+            for row in db.execute(stmt)
+        ]
         
         # Date range description
         if start_date == end_date:
@@ -661,12 +692,12 @@ def generate_sales_pdf_report(
             date_range = f"Period: {start_date} to {end_date}"
         
         # Generate PDF
-        pdf_bytes = pdf_generator.generate_sales_report(sales_data, date_range)
+        pdf_buffer = render_report(PDFReportGenerator.generate_sales_report, sales_data, date_range)
         
         # Return PDF as download
         from fastapi.responses import StreamingResponse
         return StreamingResponse(
-            io.BytesIO(pdf_bytes),
+            pdf_buffer,
             media_type="application/pdf",
             headers={
                 "Content-Disposition": f"attachment; filename=sales_report_{start_date}_{end_date}.pdf"
@@ -694,7 +725,6 @@ def generate_performance_pdf_report(
     """
     try:
         from app.utils.pdf_reports import pdf_generator
-        import io
         
         # Get performance data from view
         query = text("SELECT * FROM cashier_performance ORDER BY total_revenue DESC")
@@ -716,15 +746,18 @@ def generate_performance_pdf_report(
         # This would be expanded to create a comprehensive performance report
         # For now, return a simple placeholder
         
-        pdf_bytes = pdf_generator.generate_stock_report(
+        pdf_buffer = io.BytesIO()
+        pdf_generator.generate_stock_report(
             [{"name": "Performance Report", "current_stock": 0, "current_price_per_kg": 0, 
               "stock_status": "INFO", "stock_value": 0}],
-            report_title="Performance Report - Coming Soon"
+            report_title="Performance Report - Coming Soon",
+            output=pdf_buffer
         )
+        pdf_buffer.seek(0)
         
         from fastapi.responses import StreamingResponse
         return StreamingResponse(
-            io.BytesIO(pdf_bytes),
+            pdf_buffer,
             media_type="application/pdf",
             headers={
                 "Content-Disposition": f"attachment; filename=performance_report_{datetime.now().strftime('%Y%m%d')}.pdf"
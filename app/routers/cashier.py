@@ -5,6 +5,7 @@ Cashier role required for all endpoints.
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 from typing import List
+import io
 
 from app.database import get_db
 from app.auth import get_current_user
@@ -390,7 +391,6 @@ def generate_sale_receipt(
     """
     try:
         from app.utils.pdf_reports import pdf_generator
-        import io
         
         # Get sale details
         stmt = (
@@ -427,12 +427,14 @@ def generate_sale_receipt(
         }
         
         # Generate receipt
-        pdf_bytes = pdf_generator.generate_receipt(sale_data)
+        pdf_buffer = io.BytesIO()
+        pdf_generator.generate_receipt(sale_data, output=pdf_buffer)
+        pdf_buffer.seek(0)
         
         # Return PDF
         from fastapi.responses import StreamingResponse
         return StreamingResponse(
-            io.BytesIO(pdf_bytes),
+            pdf_buffer,
             media_type="application/pdf",
             headers={
                 "Content-Disposition": f"attachment; filename=receipt_{sale.sale_number}.pdf"
@@ -463,7 +465,6 @@ def generate_sale_receipt(
     """
     try:
         from app.utils.pdf_reports import pdf_generator
-        import io
         
         # Get sale details
         stmt = (
@@ -500,12 +501,14 @@ def generate_sale_receipt(
         }
         
         # Generate receipt
-        pdf_bytes = pdf_generator.generate_receipt(sale_data)
+        pdf_buffer = io.BytesIO()
+        pdf_generator.generate_receipt(sale_data, output=pdf_buffer)
+        pdf_buffer.seek(0)
         
         # Return PDF
         from fastapi.responses import StreamingResponse
         return StreamingResponse(
-            io.BytesIO(pdf_bytes),
+            pdf_buffer,
             media_type="application/pdf",
             headers={
                 "Content-Disposition": f"attachment; filename=receipt_{sale.sale_number}.pdf"
@@ -10,6 +10,7 @@ from datetime import datetime, timedelta
 from typing import Optional, Dict, Any
 from jose import JWTError, jwt
 from passlib.context import CryptContext
+import bcrypt
 from fastapi import HTTPException, status, Depends
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.orm import Session
@@ -18,6 +19,7 @@ import logging
 
 from app.database import get_db
 from app import models
+from app.utils.audit import audit_writer
 
 logger = logging.getLogger(__name__)
 
@@ -32,8 +34,23 @@ SECRET_KEY = os.getenv("SECRET_KEY", "your-secret-key-change-in-production")
 ALGORITHM = os.getenv("ALGORITHM", "HS256")
 ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "30"))
 
+# Shared 401 header for get_current_user
+BEARER_AUTH_HEADERS = {"WWW-Authenticate": "Bearer"}
+
+def _unauthorized(detail: str) -> HTTPException:
+    """Build a fresh 401 per raise (a shared instance would accumulate tracebacks)"""
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail=detail,
+        headers=BEARER_AUTH_HEADERS,
+    )
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a password against its hash"""
+    # Fast path: bcrypt hashes ($2a$/$2b$/$2y$) go straight to the bcrypt backend
+    # that passlib wraps, skipping passlib's per-call scheme identification
+    if hashed_password.startswith("$2"):
+        return bcrypt.checkpw(plain_password.encode("utf-8"), hashed_password.encode("utf-8"))
     return pwd_context.verify(plain_password, hashed_password)
 
 def get_password_hash(password: str) -> str:
@@ -43,13 +60,14 @@ def get_password_hash(password: str) -> str:
 def create_access_token(data: Dict[str, Any], expires_delta: Optional[timedelta] = None) -> str:
     """Create JWT access token"""
     to_encode = data.copy()
+    now = datetime.utcnow()  # Single clock read so iat and exp are consistent
     
     if expires_delta:
-        expire = datetime.utcnow() + expires_delta
+        expire = now + expires_delta
     else:
-        expire = datetime.utcnow() + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
+        expire = now + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
     
-    to_encode.update({"exp": expire, "iat": datetime.utcnow()})
+    to_encode.update({"exp": expire, "iat": now})
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
@@ -75,37 +93,21 @@ async def get_current_user(
     
     if payload is None:
         logger.warning("Invalid JWT token provided")
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid authentication credentials",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
+        raise _unauthorized("Invalid authentication credentials")
     
     username: str = payload.get("sub")
     if username is None:
         logger.warning("JWT token missing 'sub' claim")
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid authentication credentials",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
+        raise _unauthorized("Invalid authentication credentials")
     
     user = db.query(models.User).filter(models.User.username == username).first()
     if user is None:
         logger.warning(f"User not found: {username}")
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="User not found",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
+        raise _unauthorized("User not found")
     
     if not user.is_active:
         logger.warning(f"Inactive user attempted login: {username}")
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Inactive user",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
+        raise _unauthorized("Inactive user")
     
     return user
 
@@ -148,17 +150,23 @@ def audit_log_action(
     """
     Create audit log entry.
     Contract: All critical actions audit-logged.
+    Entries are handed to the background audit writer; if it is not running
+    (or its queue is full) the entry is written synchronously on `db`.
     """
+    audit_row = {
+        "user_id": user_id,
+        "action": action,
+        "table_name": table_name,
+        "record_id": record_id,
+        "old_values": old_values,
+        "new_values": new_values,
+        "notes": notes
+    }
+    if audit_writer.enqueue(audit_row):
+        return
+    
     try:
-        audit_entry = models.AuditLog(
-            user_id=user_id,
-            action=action,
-            table_name=table_name,
-            record_id=record_id,
-            old_values=old_values,
-            new_values=new_values,
-            notes=notes
-        )
+        audit_entry = models.AuditLog(**audit_row)
         db.add(audit_entry)
         db.commit()
         logger.info(f"Audit log created: {action} by user {user_id}")
@@ -0,0 +1,58 @@
+"""
+Row building and totals for the PDF reports.
+Contract: Plain-dict rows in, preformatted table rows out; no ReportLab here.
+
+Kept free of ReportLab and self so the hot per-row loops can be swapped
+for a compiled module of the same name without touching pdf_reports.
+"""
+from collections import Counter, defaultdict
+from operator import itemgetter
+from typing import Dict, List, Tuple
+
+_get_stock_status = itemgetter('stock_status')
+_get_stock_value = itemgetter('stock_value')
+
+def summarize_stock(stock: List[Dict]) -> Tuple[int, int, float]:
+    """
+    Count critical/low items and total stock value.
+    Both reductions run inside C builtins rather than a Python-level loop.
+    Returns (critical_items, low_items, total_value).
+    """
+    status_counts = Counter(map(_get_stock_status, stock))
+    total_value = float(sum(map(_get_stock_value, stock)))
+    return status_counts['CRITICAL'], status_counts['LOW'], total_value
+
+def build_sales_rows(sales: List[Dict]) -> List[List[str]]:
+    """Format each sale into a 'Sales Details' table row."""
+    return [
+        [
+            sale['sale_number'],
+            (sale.get('created_at') or '')[:10],
+            sale['item_name'],
+            f"{sale['kg_sold']:.3f}",
+            f"${sale['price_per_kg_snapshot']:.2f}",
+            f"${sale['total_price']:.2f}",
+            sale['cashier_name']
+        ]
+        for sale in sales
+    ]
+
+def build_item_summary(sales: List[Dict]) -> Tuple[float, float, Dict[str, List]]:
+    """
+    Total kg and revenue, and group sales by item in a single pass.
+    Returns (total_kg, total_revenue, {item_name: [count, kg, revenue]}).
+    """
+    total_kg = 0.0
+    total_revenue = 0.0
+    item_summary = defaultdict(lambda: [0, 0.0, 0.0])  # item -> [count, kg, revenue]
+    for sale in sales:
+        kg_sold = sale.get('kg_sold', 0)
+        total_price = sale.get('total_price', 0)
+        total_kg += kg_sold
+        total_revenue += total_price
+        
+        stats = item_summary[sale.get('item_name', 'Unknown')]
+        stats[0] += 1
+        stats[1] += kg_sold
+        stats[2] += total_price
+    return total_kg, total_revenue, item_summary
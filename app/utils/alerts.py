@@ -3,14 +3,26 @@ Alert generation utility.
 Contract: Real-time stock monitoring, prevent theft via transparency.
 """
 from sqlalchemy.orm import Session
-from sqlalchemy import select, and_, or_
+from sqlalchemy import select, func, and_, or_
 from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
+import threading
+import time
 from decimal import Decimal
 from typing import List, Optional
 
 from app.models import InventoryItem, AuditLog, Sale
+from app.crud.inventory import crud_inventory_ledger
 from app.schemas.dashboard import AlertType, AlertLevel
 
+# Dashboards poll alerts every few seconds; thresholds rarely change between polls
+ALERTS_CACHE_TTL_SECONDS = 5
+_alerts_cache = {"ts": 0.0, "data": []}
+_alerts_cache_lock = threading.Lock()
+
+# Alert checks are independent; run them concurrently so their DB I/O overlaps
+_alerts_executor = ThreadPoolExecutor(max_workers=3, thread_name_prefix="alerts")
+
 def check_stock_alerts(db: Session) -> List[dict]:
     """
     Check for stock level alerts.
@@ -21,14 +33,21 @@ def check_stock_alerts(db: Session) -> List[dict]:
     try:
         # Contract: Use operational DB patterns, not analytical
         # Check all active items for stock levels
-        stmt = select(InventoryItem).where(InventoryItem.is_active == True)
+        # Select only the columns needed (lightweight rows, no ORM hydration)
+        stmt = select(
+            InventoryItem.id,
+            InventoryItem.name,
+            InventoryItem.low_stock_level,
+            InventoryItem.critical_stock_level
+        ).where(InventoryItem.is_active == True)
         result = db.execute(stmt)
-        items = result.scalars().all()
+        items = result.all()
+        
+        # Get current stock for all items in one grouped ledger query
+        stock_map = crud_inventory_ledger.get_stock_by_item(db)
         
         for item in items:
-            # Get current stock using existing ledger calculation
-            from app.crud.inventory import crud_inventory_ledger
-            current_stock = crud_inventory_ledger.get_item_stock(db, item.id)
+            current_stock = stock_map.get(item.id, Decimal('0.000'))
             
             # Check critical stock
             if current_stock <= item.critical_stock_level:
@@ -88,17 +107,16 @@ def check_performance_alerts(db: Session) -> List[dict]:
         # Check for unusually high sales (potential errors)
         today = datetime.utcnow().date()
         
-        stmt = select(Sale).where(
+        count_stmt = select(func.count(Sale.id)).where(
             Sale.created_at >= datetime.combine(today, datetime.min.time())
         )
-        result = db.execute(stmt)
-        today_sales = result.scalars().all()
+        sales_count = db.execute(count_stmt).scalar_one()
         
-        if len(today_sales) > 100:  # Arbitrary threshold
+        if sales_count > 100:  # Arbitrary threshold
             alerts.append({
                 "alert_type": AlertType.PERFORMANCE,
                 "level": AlertLevel.INFO,
-                "message": f"High sales volume today: {len(today_sales)} transactions",
+                "message": f"High sales volume today: {sales_count} transactions",
                 "item_id": None
             })
         
@@ -108,23 +126,33 @@ def check_performance_alerts(db: Session) -> List[dict]:
         print(f"Error checking performance alerts: {e}")
         return []
 
+def _run_alert_check(check, bind) -> List[dict]:
+    """Run a single alert check on its own session (sessions are not thread-safe)."""
+    with Session(bind=bind) as session:
+        return check(session)
+
 def generate_all_alerts(db: Session) -> List[dict]:
     """
     Generate all system alerts.
     Contract: Real-time monitoring for transparency.
+    Results are cached for ALERTS_CACHE_TTL_SECONDS to absorb dashboard polling.
     """
-    all_alerts = []
-    
-    # Stock alerts
-    stock_alerts = check_stock_alerts(db)
-    all_alerts.extend(stock_alerts)
-    
-    # System alerts
-    system_alerts = check_system_alerts(db)
-    all_alerts.extend(system_alerts)
-    
-    # Performance alerts
-    perf_alerts = check_performance_alerts(db)
-    all_alerts.extend(perf_alerts)
-    
-    return all_alerts
+    with _alerts_cache_lock:
+        if time.monotonic() - _alerts_cache["ts"] < ALERTS_CACHE_TTL_SECONDS:
+            return list(_alerts_cache["data"])
+        
+        # Stock, system and performance alerts run in parallel
+        bind = db.get_bind()
+        futures = [
+            _alerts_executor.submit(_run_alert_check, check, bind)
+            for check in (check_stock_alerts, check_system_alerts, check_performance_alerts)
+        ]
+        
+        all_alerts = []
+        for future in futures:
+            all_alerts.extend(future.result())
+        
+        _alerts_cache["ts"] = time.monotonic()
+        _alerts_cache["data"] = all_alerts
+        
+        return list(all_alerts)
@@ -3,17 +3,25 @@ Archive and snapshot utilities.
 Contract: No silent deletes, maintain full audit trail.
 """
 import json
+import logging
 from datetime import datetime, timedelta
 from decimal import Decimal
 from typing import Dict, List, Optional, Tuple
 from sqlalchemy.orm import Session
 from sqlalchemy import text, select, func, and_, or_
+from sqlalchemy.exc import OperationalError
 
 from app.models import (
     ArchiveOperation, SystemSnapshot, ArchivedSale,
     Sale, InventoryItem, InventoryLedger, User
 )
 from app.schemas.archive import ArchiveAction, SnapshotType, ArchiveStatus
+from app.crud.inventory import crud_inventory_ledger
+
+logger = logging.getLogger(__name__)
+
+# Max ids bound into a single archive DELETE statement
+ARCHIVE_DELETE_BATCH_SIZE = 10000
 
 class ArchiveManager:
     """Manage archive and snapshot operations."""
@@ -27,31 +35,30 @@ class ArchiveManager:
         Create system snapshot.
         Contract: No data deletion, only archival.
         """
+        now = datetime.utcnow()
+        op_fields = {
+            "action": ArchiveAction.SNAPSHOT.value,
+            "snapshot_type": snapshot_type.value,
+            "description": description,
+            "performed_by": user_id,
+            "started_at": now
+        }
         try:
-            # Start transaction
-            self.db.begin()
-            
-            # Create archive operation record
-            archive_op = ArchiveOperation(
-                action=ArchiveAction.SNAPSHOT.value,
-                snapshot_type=snapshot_type.value,
-                description=description,
-                performed_by=user_id,
-                status=ArchiveStatus.PENDING.value,
-                started_at=datetime.utcnow()
-            )
+            # The session's transaction (begun by get_db) commits or rolls back
+            # everything below as one unit
+            archive_op = ArchiveOperation(status=ArchiveStatus.PENDING.value, **op_fields)
             self.db.add(archive_op)
             self.db.flush()  # Get ID
             
             # Collect snapshot data
-            snapshot_data = self._collect_snapshot_data(snapshot_type)
+            snapshot_data = self._collect_snapshot_data(snapshot_type, now)
             
             # Store snapshot
             snapshot = SystemSnapshot(
                 snapshot_type=snapshot_type.value,
                 snapshot_data=snapshot_data,
                 created_by=user_id,
-                expires_at=datetime.utcnow() + timedelta(days=90),
+                expires_at=now + timedelta(days=90),
                 is_active=True
             )
             self.db.add(snapshot)
@@ -74,71 +81,73 @@ class ArchiveManager:
             self.db.rollback()
             
             # Log failed operation
-            if 'archive_op' in locals():
-                archive_op.status = ArchiveStatus.FAILED.value
-                archive_op.completed_at = datetime.utcnow()
-                archive_op.error_message = str(e)
-                self.db.commit()
+            self._record_failed_operation(op_fields, e)
             
             return {
                 "success": False,
                 "error": str(e)
             }
     
-    def _collect_snapshot_data(self, snapshot_type: SnapshotType) -> Dict:
-        """Collect data for snapshot based on type."""
+    def _collect_snapshot_data(self, snapshot_type: SnapshotType, now: datetime) -> Dict:
+        """Collect data for snapshot based on type, as of `now`."""
         data = {
-            "timestamp": datetime.utcnow().isoformat(),
+            "timestamp": now,
             "snapshot_type": snapshot_type.value
         }
         
         if snapshot_type == SnapshotType.FULL_SYSTEM:
             data["inventory"] = self._get_inventory_summary()
-            data["sales"] = self._get_sales_summary(days=7)
+            data["sales"] = self._get_sales_summary(now, days=7)
             data["users"] = self._get_users_summary()
-            data["system_health"] = self._get_system_health()
+            data["system_health"] = self._get_system_health(now)
             
         elif snapshot_type == SnapshotType.SALES_ONLY:
-            data["sales_summary"] = self._get_sales_summary(days=30)
+            data["sales_summary"] = self._get_sales_summary(now, days=30)
             data["recent_sales"] = self._get_recent_sales(limit=1000)
             
         elif snapshot_type == SnapshotType.INVENTORY_ONLY:
             data["inventory"] = self._get_inventory_summary()
-            data["ledger_summary"] = self._get_ledger_summary()
+            data["ledger_summary"] = self._get_ledger_summary(now)
             
         return data
     
     def _get_inventory_summary(self) -> List[Dict]:
         """Get inventory summary for snapshot."""
-        stmt = select(InventoryItem).where(InventoryItem.is_active == True)
+        # Select only the columns needed (lightweight rows, no ORM hydration)
+        stmt = select(
+            InventoryItem.id,
+            InventoryItem.name,
+            InventoryItem.current_price_per_kg,
+            InventoryItem.low_stock_level,
+            InventoryItem.critical_stock_level,
+            InventoryItem.is_active
+        ).where(InventoryItem.is_active == True)
         result = self.db.execute(stmt)
-        items = result.scalars().all()
+        items = result.all()
+        
+        # Get current stock for all items in one grouped query
+        stock_map = crud_inventory_ledger.get_stock_by_item(self.db)
         
         summary = []
         for item in items:
-            # Get current stock
-            stock_stmt = select(func.coalesce(func.sum(InventoryLedger.kg_change), 0)).where(
-                InventoryLedger.item_id == item.id
-            )
-            stock_result = self.db.execute(stock_stmt)
-            current_stock = stock_result.scalar() or 0
+            current_stock = stock_map.get(item.id, Decimal('0.000'))
             
             summary.append({
                 "id": item.id,
                 "name": item.name,
-                "current_price_per_kg": float(item.current_price_per_kg),
-                "current_stock": float(current_stock),
-                "stock_value": float(current_stock * item.current_price_per_kg),
-                "low_stock_level": float(item.low_stock_level),
-                "critical_stock_level": float(item.critical_stock_level),
+                "current_price_per_kg": item.current_price_per_kg,
+                "current_stock": current_stock,
+                "stock_value": current_stock * item.current_price_per_kg,
+                "low_stock_level": item.low_stock_level,
+                "critical_stock_level": item.critical_stock_level,
                 "is_active": item.is_active
             })
         
         return summary
     
-    def _get_sales_summary(self, days: int = 7) -> Dict:
-        """Get sales summary for given period."""
-        cutoff_date = datetime.utcnow() - timedelta(days=days)
+    def _get_sales_summary(self, now: datetime, days: int = 7) -> Dict:
+        """Get sales summary for given period ending at `now`."""
+        cutoff_date = now - timedelta(days=days)
         
         # Count sales
         count_stmt = select(func.count(Sale.id)).where(
@@ -160,24 +169,34 @@ class ArchiveManager:
         revenue_result = self.db.execute(revenue_stmt)
         total_revenue = revenue_result.scalar() or 0
         
-        # Top items
-        top_items_stmt = text("""
-            SELECT i.name, COUNT(s.id) as sales_count, 
-                   SUM(s.kg_sold) as total_kg, SUM(s.total_price) as total_revenue
-            FROM sales s
-            JOIN inventory_items i ON s.item_id = i.id
-            WHERE s.created_at >= :cutoff AND s.status = 'ACTIVE'
-            GROUP BY i.id, i.name
-            ORDER BY total_revenue DESC
-            LIMIT 5
-        """)
-        top_items_result = self.db.execute(top_items_stmt, {"cutoff": cutoff_date})
+        # Top items (Core select, so the compiled statement is cached and reused)
+        total_revenue_col = func.sum(Sale.total_price).label("total_revenue")
+        top_items_stmt = (
+            select(
+                InventoryItem.name,
+                func.count(Sale.id).label("sales_count"),
+                func.sum(Sale.kg_sold).label("total_kg"),
+                total_revenue_col
+            )
+            .select_from(Sale)
+            .join(InventoryItem, Sale.item_id == InventoryItem.id)
+            .where(
+                and_(
+                    Sale.created_at >= cutoff_date,
+                    Sale.status == "ACTIVE"
+                )
+            )
+            .group_by(InventoryItem.id, InventoryItem.name)
+            .order_by(total_revenue_col.desc())
+            .limit(5)
+        )
+        top_items_result = self.db.execute(top_items_stmt)
         top_items = [
             {
                 "name": row[0],
                 "sales_count": row[1],
-                "total_kg": float(row[2]),
-                "total_revenue": float(row[3])
+                "total_kg": row[2],
+                "total_revenue": row[3]
             }
             for row in top_items_result
         ]
@@ -185,59 +204,75 @@ class ArchiveManager:
         return {
             "period_days": days,
             "sales_count": sales_count,
-            "total_revenue": float(total_revenue),
+            "total_revenue": total_revenue,
             "avg_daily_sales": sales_count / days if days > 0 else 0,
             "top_items": top_items,
-            "cutoff_date": cutoff_date.isoformat()
+            "cutoff_date": cutoff_date
         }
     
     def _get_recent_sales(self, limit: int = 100) -> List[Dict]:
         """Get recent sales for snapshot."""
+        # Select plain columns (no ORM hydration) and stream rows in batches
         stmt = (
-            select(Sale)
+            select(
+                Sale.id, Sale.sale_number, Sale.item_id, Sale.kg_sold,
+                Sale.total_price, Sale.cashier_id, Sale.created_at
+            )
             .where(Sale.status == "ACTIVE")
             .order_by(Sale.created_at.desc())
             .limit(limit)
+            .execution_options(yield_per=500)
         )
         result = self.db.execute(stmt)
-        sales = result.scalars().all()
         
         return [
             {
-                "id": sale.id,
-                "sale_number": sale.sale_number,
-                "item_id": sale.item_id,
-                "kg_sold": float(sale.kg_sold),
-                "total_price": float(sale.total_price) if sale.total_price else 0,
-                "cashier_id": sale.cashier_id,
-                "created_at": sale.created_at.isoformat() if sale.created_at else None
+                "id": row.id,
+                "sale_number": row.sale_number,
+                "item_id": row.item_id,
+                "kg_sold": row.kg_sold,
+                "total_price": row.total_price or 0,
+                "cashier_id": row.cashier_id,
+                "created_at": row.created_at
             }
-            for sale in sales
+            for row in result
         ]
     
     def _get_users_summary(self) -> Dict:
         """Get users summary."""
-        stmt = select(User)
+        # Let the database count users per (role, is_active) group
+        stmt = (
+            select(User.role, User.is_active, func.count(User.id))
+            .group_by(User.role, User.is_active)
+        )
         result = self.db.execute(stmt)
-        users = result.scalars().all()
         
-        active_admins = sum(1 for u in users if u.role == "admin" and u.is_active)
-        active_cashiers = sum(1 for u in users if u.role == "cashier" and u.is_active)
+        total_users = 0
+        active_admins = 0
+        active_cashiers = 0
+        for role, is_active, count in result:
+            total_users += count
+            if is_active and role == "admin":
+                active_admins += count
+            elif is_active and role == "cashier":
+                active_cashiers += count
         
         return {
-            "total_users": len(users),
+            "total_users": total_users,
             "active_admins": active_admins,
             "active_cashiers": active_cashiers,
-            "inactive_users": len(users) - (active_admins + active_cashiers)
+            "inactive_users": total_users - (active_admins + active_cashiers)
         }
     
-    def _get_system_health(self) -> Dict:
+    def _get_system_health(self, now: datetime) -> Dict:
         """Get system health metrics."""
         # Check database connectivity
+        # Reuse the session's connection; pool_pre_ping already validates it
+        # on checkout, so no extra SELECT 1 round-trip is needed
         db_health = "HEALTHY"
         try:
-            self.db.execute(text("SELECT 1"))
-        except:
+            self.db.connection()
+        except OperationalError:
             db_health = "UNHEALTHY"
         
         # Count pending operations
@@ -250,10 +285,10 @@ class ArchiveManager:
         return {
             "database": db_health,
             "pending_archive_operations": pending_ops,
-            "timestamp": datetime.utcnow().isoformat()
+            "timestamp": now
         }
     
-    def _get_ledger_summary(self) -> Dict:
+    def _get_ledger_summary(self, now: datetime) -> Dict:
         """Get ledger summary."""
         # Total ledger entries
         total_stmt = select(func.count(InventoryLedger.id))
@@ -261,7 +296,7 @@ class ArchiveManager:
         total_entries = total_result.scalar() or 0
         
         # Last 30 days activity
-        month_ago = datetime.utcnow() - timedelta(days=30)
+        month_ago = now - timedelta(days=30)
         recent_stmt = select(func.count(InventoryLedger.id)).where(
             InventoryLedger.created_at >= month_ago
         )
@@ -291,63 +326,63 @@ class ArchiveManager:
         Archive sales older than specified days.
         Contract: Move to archive table, never delete.
         """
+        now = datetime.utcnow()
+        op_fields = {
+            "action": ArchiveAction.RESET.value,
+            "description": description,
+            "performed_by": user_id,
+            "started_at": now
+        }
         try:
-            self.db.begin()
-            
-            # Create archive operation record
-            archive_op = ArchiveOperation(
-                action=ArchiveAction.RESET.value,
-                description=description,
-                performed_by=user_id,
-                status=ArchiveStatus.PENDING.value,
-                started_at=datetime.utcnow()
-            )
+            # The session's transaction (begun by get_db) commits or rolls back
+            # the archive insert and the delete together
+            archive_op = ArchiveOperation(status=ArchiveStatus.PENDING.value, **op_fields)
             self.db.add(archive_op)
             self.db.flush()
             
             # Calculate cutoff date
-            cutoff_date = datetime.utcnow() - timedelta(days=days_old)
+            cutoff_date = now - timedelta(days=days_old)
             
-            # Find sales to archive
+            # Find sales to archive (streamed in batches, not loaded at once)
             sales_stmt = select(Sale).where(
                 and_(
                     Sale.created_at < cutoff_date,
                     Sale.status == "ACTIVE"
                 )
-            )
+            ).execution_options(yield_per=1000)
             sales_result = self.db.execute(sales_stmt)
-            sales_to_archive = sales_result.scalars().all()
             
-            records_archived = 0
+            archived_rows = [
+                {
+                    "id": sale.id,
+                    "sale_number": sale.sale_number,
+                    "item_id": sale.item_id,
+                    "kg_sold": sale.kg_sold,
+                    "price_per_kg_snapshot": sale.price_per_kg_snapshot,
+                    "total_price": sale.total_price,
+                    "cashier_id": sale.cashier_id,
+                    "customer_name": sale.customer_name,
+                    "status": sale.status,
+                    "original_created_at": sale.created_at,
+                    "archive_operation_id": archive_op.id
+                }
+                for sale in sales_result.scalars()
+            ]
+            records_archived = len(archived_rows)
             
-            # Archive each sale
-            for sale in sales_to_archive:
-                archived_sale = ArchivedSale(
-                    id=sale.id,
-                    sale_number=sale.sale_number,
-                    item_id=sale.item_id,
-                    kg_sold=sale.kg_sold,
-                    price_per_kg_snapshot=sale.price_per_kg_snapshot,
-                    total_price=sale.total_price,
-                    cashier_id=sale.cashier_id,
-                    customer_name=sale.customer_name,
-                    status=sale.status,
-                    original_created_at=sale.created_at,
-                    archive_operation_id=archive_op.id
-                )
-                self.db.add(archived_sale)
-                records_archived += 1
-            
-            # Delete from main table (now archived)
             if records_archived > 0:
-                delete_stmt = text("""
-                    DELETE FROM sales 
-                    WHERE id IN (
-                        SELECT id FROM archived_sales 
-                        WHERE archive_operation_id = :op_id
+                # Archive all sales in a single multi-row INSERT
+                self.db.bulk_insert_mappings(ArchivedSale, archived_rows)
+                
+                # Delete from main table (now archived), binding the ids as a
+                # Postgres array in bounded chunks
+                sale_ids = [row["id"] for row in archived_rows]
+                delete_stmt = text("DELETE FROM sales WHERE id = ANY(:ids)")
+                for start in range(0, len(sale_ids), ARCHIVE_DELETE_BATCH_SIZE):
+                    self.db.execute(
+                        delete_stmt,
+                        {"ids": sale_ids[start:start + ARCHIVE_DELETE_BATCH_SIZE]}
                     )
-                """)
-                self.db.execute(delete_stmt, {"op_id": archive_op.id})
             
             # Update archive operation
             archive_op.status = ArchiveStatus.COMPLETED.value
@@ -366,17 +401,30 @@ class ArchiveManager:
         except Exception as e:
             self.db.rollback()
             
-            if 'archive_op' in locals():
-                archive_op.status = ArchiveStatus.FAILED.value
-                archive_op.completed_at = datetime.utcnow()
-                archive_op.error_message = str(e)
-                self.db.commit()
+            self._record_failed_operation(op_fields, e)
             
             return {
                 "success": False,
                 "error": str(e)
             }
     
+    def _record_failed_operation(self, op_fields: Dict, error: Exception):
+        """
+        Record a FAILED archive operation.
+        Uses its own session: the main transaction (including the PENDING
+        record) has been rolled back, so the failure must commit separately.
+        """
+        try:
+            with Session(bind=self.db.get_bind()) as session, session.begin():
+                session.add(ArchiveOperation(
+                    status=ArchiveStatus.FAILED.value,
+                    completed_at=datetime.utcnow(),
+                    error_message=str(error),
+                    **op_fields
+                ))
+        except Exception as e:
+            logger.error(f"Failed to record failed archive operation: {e}")
+    
     def get_archive_summary(self) -> Dict:
         """Get archive system summary."""
         # Use the database view
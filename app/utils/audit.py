@@ -0,0 +1,97 @@
+"""
+Background audit log writer.
+Contract: All critical actions audit-logged, audit failure shouldn't break main operation.
+"""
+import logging
+import queue
+import threading
+from typing import Dict, List, Optional
+
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from app.database import engine
+from app.models import AuditLog
+
+logger = logging.getLogger(__name__)
+
+AUDIT_QUEUE_MAXSIZE = 10000
+AUDIT_BATCH_SIZE = 100
+AUDIT_FLUSH_INTERVAL = 0.1  # seconds
+
+class AuditLogWriter:
+    """Buffer audit rows in memory and write them in batches on a background thread."""
+
+    def __init__(self, bind=engine):
+        self.bind = bind
+        self.queue: "queue.Queue[Dict]" = queue.Queue(maxsize=AUDIT_QUEUE_MAXSIZE)
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        """Start the background writer thread."""
+        if self.running:
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="audit-log-writer", daemon=True)
+        self._thread.start()
+        logger.info("Audit log writer started")
+
+    def stop(self, timeout: float = 10.0):
+        """Stop the writer, flushing every entry still queued."""
+        if not self.running:
+            return
+        self._stop_event.set()
+        self._thread.join(timeout)
+        self._thread = None
+        logger.info("Audit log writer stopped")
+
+    def enqueue(self, row: Dict) -> bool:
+        """
+        Queue an audit row for writing.
+        Returns False if the writer is not running or the queue is full,
+        in which case the caller should write the row itself.
+        """
+        if not self.running:
+            return False
+        try:
+            self.queue.put_nowait(row)
+            return True
+        except queue.Full:
+            logger.warning("Audit log queue full, falling back to synchronous write")
+            return False
+
+    def _run(self):
+        while not self._stop_event.is_set() or not self.queue.empty():
+            try:
+                first = self.queue.get(timeout=AUDIT_FLUSH_INTERVAL)
+            except queue.Empty:
+                continue
+            self._write([first] + self._drain(AUDIT_BATCH_SIZE - 1))
+
+    def _drain(self, limit: int) -> List[Dict]:
+        rows = []
+        while len(rows) < limit:
+            try:
+                rows.append(self.queue.get_nowait())
+            except queue.Empty:
+                break
+        return rows
+
+    def _write(self, rows: List[Dict]):
+        """Write a batch of audit rows in a single multi-row INSERT."""
+        try:
+            with Session(bind=self.bind) as session:
+                session.execute(insert(AuditLog), rows)
+                session.commit()
+            logger.info(f"Audit log batch written: {len(rows)} entries")
+        except Exception as e:
+            # Don't raise, audit failure shouldn't break the writer
+            logger.error(f"Failed to write audit log batch of {len(rows)} entries: {e}")
+
+# Create global instance
+audit_writer = AuditLogWriter()
@@ -0,0 +1,36 @@
+"""
+Response compression middleware.
+Contract: Compress JSON responses; PDFs are already Flate-compressed by ReportLab.
+"""
+from starlette.datastructures import Headers
+from starlette.middleware.gzip import GZipMiddleware, GZipResponder
+from starlette.types import Message, Receive, Scope, Send
+
+# Content types that are already compressed; gzipping them only burns CPU
+SKIP_GZIP_CONTENT_TYPES = ("application/pdf",)
+
+class _SkipCompressedGZipResponder(GZipResponder):
+    """GZipResponder that passes already-compressed responses through untouched."""
+
+    passthrough = False
+
+    async def send_with_gzip(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            content_type = Headers(raw=message["headers"]).get("content-type", "")
+            self.passthrough = content_type.startswith(SKIP_GZIP_CONTENT_TYPES)
+        if self.passthrough:
+            await self.send(message)
+            return
+        await super().send_with_gzip(message)
+
+class SkipCompressedGZipMiddleware(GZipMiddleware):
+    """GZipMiddleware that skips PDF (and other already-compressed) responses."""
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http" and "gzip" in Headers(scope=scope).get("Accept-Encoding", ""):
+            responder = _SkipCompressedGZipResponder(
+                self.app, self.minimum_size, compresslevel=self.compresslevel
+            )
+            await responder(scope, receive, send)
+            return
+        await self.app(scope, receive, send)
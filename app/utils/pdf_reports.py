@@ -2,21 +2,86 @@
 PDF report generation utility.
 Contract: Simplicity, use existing constraints, no complex formatting.
 """
+import hashlib
 import io
-from datetime import datetime, date
-from decimal import Decimal
-from typing import List, Dict, Any, Optional
+import logging
+import multiprocessing
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime
+from typing import List, Dict, Optional, BinaryIO, Callable, Tuple, TypedDict
+import orjson
 from reportlab.lib import colors
-from reportlab.lib.pagesizes import letter, A4
+from reportlab.lib.pagesizes import A4
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.units import inch, cm
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, Image
-from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_RIGHT
-from reportlab.pdfgen import canvas
-from reportlab.graphics.shapes import Drawing
-from reportlab.graphics.charts.barcharts import VerticalBarChart
-from reportlab.graphics.charts.piecharts import Pie
-from reportlab.graphics.charts.legends import Legend
+from reportlab.lib.units import inch
+from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, LongTable, TableStyle
+from reportlab.platypus.flowables import HRFlowable
+from reportlab.lib.enums import TA_CENTER, TA_RIGHT
+
+from app.utils._pdf_rows import build_sales_rows, build_item_summary, summarize_stock
+
+logger = logging.getLogger(__name__)
+
+class StockRow(TypedDict):
+    """Stock report row, built by the router straight from query rows."""
+    id: int
+    name: str
+    current_stock: float
+    current_price_per_kg: float
+    low_stock_level: float
+    critical_stock_level: float
+    stock_status: str
+    stock_value: float
+
+class SalesRow(TypedDict):
+    """Sales report row, built by the router straight from query rows."""
+    sale_number: str
+    created_at: str
+    item_name: str
+    kg_sold: float
+    price_per_kg_snapshot: float
+    total_price: float
+    cashier_name: str
+    customer_name: Optional[str]
+
+# Page setup shared by every report of a kind
+# pageCompression=1 Flate-compresses page content streams regardless of rl_config
+_A4_DOC_KWARGS = dict(pagesize=A4, rightMargin=72, leftMargin=72, topMargin=72, bottomMargin=72,
+                      pageCompression=1)
+_RECEIPT_DOC_KWARGS = dict(pagesize=(3.5*inch, 8*inch),  # Receipt size
+                           rightMargin=10, leftMargin=10, topMargin=10, bottomMargin=10,
+                           pageCompression=1)
+
+_STATUS_COLOR = {'CRITICAL': '🔴', 'LOW': '🟡', 'NORMAL': '🟢'}
+# Fixed (header, body) row heights so ReportLab skips measuring every cell.
+# Cells are single-line strings: stock body 9pt/header 10pt + 12pt padding,
+# sales body 8pt/header 9pt + 10pt padding.
+_STOCK_ROW_HEIGHTS = (0.4*inch, 0.25*inch)
+_SALES_ROW_HEIGHTS = (0.35*inch, 0.22*inch)
+
+def _row_heights(n_rows: int, header_height: float, body_height: float) -> List[float]:
+    """Row heights for a table with one header row."""
+    return [header_height] + [body_height] * (n_rows - 1)
+
+# Preformatted cell text for the known statuses
+_STATUS_LABEL = {status: f"{color} {status}" for status, color in _STATUS_COLOR.items()}
+
+def _status_label(status: str) -> str:
+    """Stock status cell text, e.g. '🔴 CRITICAL'."""
+    try:
+        return _STATUS_LABEL[status]
+    except KeyError:
+        return f"⚪ {status}"
+
+# Rendered-report LRU: entry count, and how long an entry may be served.
+# The TTL keeps the "Generated:" time in cached PDFs close to the download time.
+REPORT_CACHE_SIZE = 16
+REPORT_CACHE_TTL_SECONDS = 60
 
 class PDFReportGenerator:
     """Generate PDF reports following contract simplicity."""
@@ -24,6 +89,11 @@ class PDFReportGenerator:
     def __init__(self):
         self.styles = getSampleStyleSheet()
         self._setup_custom_styles()
+        self._setup_receipt_styles()
+        self._setup_table_styles()
+        # LRU of recently rendered reports: (report, args, data digest) -> (rendered at, PDF bytes)
+        self._report_cache: "OrderedDict[Tuple, Tuple[float, bytes]]" = OrderedDict()
+        self._report_cache_lock = threading.Lock()
     
     def _setup_custom_styles(self):
         """Setup custom paragraph styles."""
@@ -83,26 +153,112 @@ class PDFReportGenerator:
             alignment=TA_CENTER
         ))
     
-    def generate_stock_report(self, stock_data: List[Dict], report_title: str = "Stock Report") -> bytes:
+    def _setup_receipt_styles(self):
+        """Setup receipt paragraph styles once (receipts are the POS hot path)."""
+        self._receipt_styles = {
+            'header': ParagraphStyle(name='ReceiptHeader',
+                                     fontSize=16,
+                                     alignment=TA_CENTER,
+                                     textColor=colors.HexColor('#2c3e50'),
+                                     spaceAfter=10),
+            'sub': ParagraphStyle(name='ReceiptSub',
+                                  fontSize=12,
+                                  alignment=TA_CENTER,
+                                  textColor=colors.grey,
+                                  spaceAfter=20),
+            'info': ParagraphStyle(name='ReceiptInfo', fontSize=10),
+            'item': ParagraphStyle(name='ItemStyle', fontSize=10),
+            'total': ParagraphStyle(name='TotalStyle', fontSize=12, alignment=TA_RIGHT),
+            'footer': ParagraphStyle(name='FooterNote', fontSize=8, alignment=TA_CENTER),
+        }
+    
+    def _receipt_separator(self) -> HRFlowable:
+        """Horizontal rule between receipt sections (a vector stroke, no text layout)."""
+        return HRFlowable(width="100%", thickness=0.5, color=colors.black,
+                          spaceBefore=2, spaceAfter=4)
+    
+    def _setup_table_styles(self):
+        """Setup report table styles once instead of per report."""
+        self._stock_table_style = TableStyle([
+            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#2c3e50')),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
+            ('ALIGN', (0, 0), (-1, 0), 'CENTER'),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, 0), 10),
+            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+            ('BACKGROUND', (0, 1), (-1, -1), colors.white),
+            ('TEXTCOLOR', (0, 1), (-1, -1), colors.black),
+            ('ALIGN', (1, 1), (3, -1), 'RIGHT'),
+            ('ALIGN', (4, 1), (4, -1), 'CENTER'),
+            ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
+            ('FONTSIZE', (0, 1), (-1, -1), 9),
+            ('GRID', (0, 0), (-1, -1), 1, colors.grey),
+            ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.whitesmoke, colors.white]),
+        ])
+        
+        self._sales_table_style = TableStyle([
+            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#27ae60')),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
+            ('ALIGN', (0, 0), (-1, 0), 'CENTER'),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, 0), 9),
+            ('BOTTOMPADDING', (0, 0), (-1, 0), 10),
+            ('BACKGROUND', (0, 1), (-1, -1), colors.white),
+            ('TEXTCOLOR', (0, 1), (-1, -1), colors.black),
+            ('ALIGN', (3, 1), (5, -1), 'RIGHT'),
+            ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
+            ('FONTSIZE', (0, 1), (-1, -1), 8),
+            ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
+            ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.whitesmoke, colors.white]),
+        ])
+        
+        self._sales_summary_table_style = TableStyle([
+            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#3498db')),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
+            ('ALIGN', (0, 0), (-1, 0), 'CENTER'),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, 0), 9),
+            ('BACKGROUND', (0, 1), (-1, -1), colors.white),
+            ('ALIGN', (1, 1), (-1, -1), 'RIGHT'),
+            ('GRID', (0, 0), (-1, -1), 0.5, colors.lightgrey),
+        ])
+    
+    def get_cached_report(self, key: Tuple) -> Optional[bytes]:
+        """Return cached PDF bytes for `key`, if present and not expired."""
+        with self._report_cache_lock:
+            entry = self._report_cache.get(key)
+            if entry is None:
+                return None
+            rendered_at, pdf_bytes = entry
+            if time.monotonic() - rendered_at > REPORT_CACHE_TTL_SECONDS:
+                del self._report_cache[key]
+                return None
+            self._report_cache.move_to_end(key)
+            return pdf_bytes
+    
+    def cache_report(self, key: Tuple, pdf_bytes: bytes):
+        """Store rendered PDF bytes, evicting the least recently used entry."""
+        with self._report_cache_lock:
+            self._report_cache[key] = (time.monotonic(), pdf_bytes)
+            self._report_cache.move_to_end(key)
+            while len(self._report_cache) > REPORT_CACHE_SIZE:
+                self._report_cache.popitem(last=False)
+    
+    def generate_stock_report(self, stock_data: List[StockRow], report_title: str = "Stock Report",
+                              output: Optional[BinaryIO] = None) -> Optional[bytes]:
         """
         Generate stock level PDF report.
         
         Args:
             stock_data: List of stock items with details
             report_title: Title of the report
+            output: Optional binary stream to write the PDF into
             
         Returns:
-            PDF bytes
+            PDF bytes, or None if written to `output`
         """
-        buffer = io.BytesIO()
-        doc = SimpleDocTemplate(
-            buffer,
-            pagesize=A4,
-            rightMargin=72,
-            leftMargin=72,
-            topMargin=72,
-            bottomMargin=72
-        )
+        buffer = output if output is not None else io.BytesIO()
+        doc = SimpleDocTemplate(buffer, **_A4_DOC_KWARGS)
         
         story = []
         
@@ -112,11 +268,9 @@ class PDFReportGenerator:
                               self.styles['ReportSubtitle']))
         story.append(Spacer(1, 20))
         
-        # Summary section
+        # Summary section (single pass; values are only formatted, so floats suffice)
         total_items = len(stock_data)
-        critical_items = sum(1 for item in stock_data if item.get('stock_status') == 'CRITICAL')
-        low_items = sum(1 for item in stock_data if item.get('stock_status') == 'LOW')
-        total_value = sum(Decimal(str(item.get('stock_value', 0))) for item in stock_data)
+        critical_items, low_items, total_value = summarize_stock(stock_data)
         
         summary_text = f"""
         <b>Summary:</b><br/>
@@ -132,42 +286,21 @@ class PDFReportGenerator:
         story.append(Paragraph("Current Stock Levels", self.styles['SectionHeader']))
         
         # Prepare table data
-        table_data = [['Item', 'Current Stock (kg)', 'Price/kg', 'Stock Value', 'Status']]
-        
-        for item in stock_data:
-            status = item.get('stock_status', 'NORMAL')
-            status_color = {
-                'CRITICAL': '🔴',
-                'LOW': '🟡',
-                'NORMAL': '🟢'
-            }.get(status, '⚪')
-            
-            table_data.append([
-                item.get('name', ''),
-                f"{item.get('current_stock', 0):.3f}",
-                f"${item.get('current_price_per_kg', 0):.2f}",
-                f"${item.get('stock_value', 0):,.2f}",
-                f"{status_color} {status}"
-            ])
+        table_data = [['Item', 'Current Stock (kg)', 'Price/kg', 'Stock Value', 'Status']] + [
+            [
+                item['name'],
+                f"{item['current_stock']:.3f}",
+                f"${item['current_price_per_kg']:.2f}",
+                f"${item['stock_value']:,.2f}",
+                _status_label(item.get('stock_status', 'NORMAL'))
+            ]
+            for item in stock_data
+        ]
         
         # Create table
-        table = Table(table_data, colWidths=[3*inch, 1.5*inch, 1*inch, 1.2*inch, 1.2*inch])
-        table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#2c3e50')),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
-            ('ALIGN', (0, 0), (-1, 0), 'CENTER'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 10),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-            ('BACKGROUND', (0, 1), (-1, -1), colors.white),
-            ('TEXTCOLOR', (0, 1), (-1, -1), colors.black),
-            ('ALIGN', (1, 1), (3, -1), 'RIGHT'),
-            ('ALIGN', (4, 1), (4, -1), 'CENTER'),
-            ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-            ('FONTSIZE', (0, 1), (-1, -1), 9),
-            ('GRID', (0, 0), (-1, -1), 1, colors.grey),
-            ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.whitesmoke, colors.white]),
-        ]))
+        table = Table(table_data, colWidths=[3*inch, 1.5*inch, 1*inch, 1.2*inch, 1.2*inch],
+                      rowHeights=_row_heights(len(table_data), *_STOCK_ROW_HEIGHTS))
+        table.setStyle(self._stock_table_style)
         
         story.append(table)
         story.append(Spacer(1, 30))
@@ -182,29 +315,25 @@ class PDFReportGenerator:
         # Build PDF
         doc.build(story)
         
-        buffer.seek(0)
+        if output is not None:
+            return None
         return buffer.getvalue()
     
-    def generate_sales_report(self, sales_data: List[Dict], date_range: str = "Daily") -> bytes:
+    def generate_sales_report(self, sales_data: List[SalesRow], date_range: str = "Daily",
+                              output: Optional[BinaryIO] = None) -> Optional[bytes]:
         """
         Generate sales PDF report.
         
         Args:
             sales_data: List of sales records
             date_range: Date range description
+            output: Optional binary stream to write the PDF into
             
         Returns:
-            PDF bytes
+            PDF bytes, or None if written to `output`
         """
-        buffer = io.BytesIO()
-        doc = SimpleDocTemplate(
-            buffer,
-            pagesize=A4,
-            rightMargin=72,
-            leftMargin=72,
-            topMargin=72,
-            bottomMargin=72
-        )
+        buffer = output if output is not None else io.BytesIO()
+        doc = SimpleDocTemplate(buffer, **_A4_DOC_KWARGS)
         
         story = []
         
@@ -214,11 +343,11 @@ class PDFReportGenerator:
                               self.styles['ReportSubtitle']))
         story.append(Spacer(1, 20))
         
-        # Calculate totals
+        # Calculate totals and group by item in a single pass
         total_sales = len(sales_data)
-        total_kg = sum(Decimal(str(sale.get('kg_sold', 0))) for sale in sales_data)
-        total_revenue = sum(Decimal(str(sale.get('total_price', 0))) for sale in sales_data)
-        avg_sale_value = total_revenue / total_sales if total_sales > 0 else Decimal('0')
+        total_kg, total_revenue, item_summary = build_item_summary(sales_data)
+        
+        avg_sale_value = total_revenue / total_sales if total_sales > 0 else 0.0
         
         summary_text = f"""
         <b>Summary:</b><br/>
@@ -235,36 +364,15 @@ class PDFReportGenerator:
         
         # Prepare table data
         table_data = [['Sale #', 'Date', 'Item', 'KG', 'Price', 'Total', 'Cashier']]
-        
-        for sale in sales_data:
-            table_data.append([
-                sale.get('sale_number', ''),
-                sale.get('created_at', '')[:10] if sale.get('created_at') else '',
-                sale.get('item_name', ''),
-                f"{sale.get('kg_sold', 0):.3f}",
-                f"${sale.get('price_per_kg_snapshot', 0):.2f}",
-                f"${sale.get('total_price', 0):.2f}",
-                sale.get('cashier_name', '')
-            ])
+        table_data += build_sales_rows(sales_data)
         
         # Create table
-        table = Table(table_data, colWidths=[1.2*inch, 1*inch, 1.8*inch, 0.8*inch, 
-                                            0.8*inch, 0.9*inch, 1.5*inch])
-        table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#27ae60')),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
-            ('ALIGN', (0, 0), (-1, 0), 'CENTER'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 9),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 10),
-            ('BACKGROUND', (0, 1), (-1, -1), colors.white),
-            ('TEXTCOLOR', (0, 1), (-1, -1), colors.black),
-            ('ALIGN', (3, 1), (5, -1), 'RIGHT'),
-            ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-            ('FONTSIZE', (0, 1), (-1, -1), 8),
-            ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-            ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.whitesmoke, colors.white]),
-        ]))
+        # LongTable splits across pages in linear time; header repeats per page
+        table = LongTable(table_data, colWidths=[1.2*inch, 1*inch, 1.8*inch, 0.8*inch, 
+                                                0.8*inch, 0.9*inch, 1.5*inch],
+                          rowHeights=_row_heights(len(table_data), *_SALES_ROW_HEIGHTS),
+                          repeatRows=1)
+        table.setStyle(self._sales_table_style)
         
         story.append(table)
         story.append(Spacer(1, 30))
@@ -272,43 +380,14 @@ class PDFReportGenerator:
         # Summary by item
         story.append(Paragraph("Summary by Item", self.styles['SectionHeader']))
         
-        # Group by item
-        item_summary = {}
-        for sale in sales_data:
-            item_name = sale.get('item_name', 'Unknown')
-            if item_name not in item_summary:
-                item_summary[item_name] = {
-                    'count': 0,
-                    'total_kg': Decimal('0'),
-                    'total_revenue': Decimal('0')
-                }
-            
-            item_summary[item_name]['count'] += 1
-            item_summary[item_name]['total_kg'] += Decimal(str(sale.get('kg_sold', 0)))
-            item_summary[item_name]['total_revenue'] += Decimal(str(sale.get('total_price', 0)))
-        
         # Create item summary table
-        summary_table_data = [['Item', 'Sales Count', 'Total KG', 'Total Revenue']]
-        
-        for item_name, stats in item_summary.items():
-            summary_table_data.append([
-                item_name,
-                str(stats['count']),
-                f"{stats['total_kg']:.3f}",
-                f"${stats['total_revenue']:,.2f}"
-            ])
+        summary_table_data = [['Item', 'Sales Count', 'Total KG', 'Total Revenue']] + [
+            [item_name, str(count), f"{item_kg:.3f}", f"${item_revenue:,.2f}"]
+            for item_name, (count, item_kg, item_revenue) in item_summary.items()
+        ]
         
         summary_table = Table(summary_table_data, colWidths=[2.5*inch, 1*inch, 1*inch, 1.2*inch])
-        summary_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#3498db')),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
-            ('ALIGN', (0, 0), (-1, 0), 'CENTER'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 9),
-            ('BACKGROUND', (0, 1), (-1, -1), colors.white),
-            ('ALIGN', (1, 1), (-1, -1), 'RIGHT'),
-            ('GRID', (0, 0), (-1, -1), 0.5, colors.lightgrey),
-        ]))
+        summary_table.setStyle(self._sales_summary_table_style)
         
         story.append(summary_table)
         story.append(Spacer(1, 30))
@@ -323,50 +402,34 @@ class PDFReportGenerator:
         # Build PDF
         doc.build(story)
         
-        buffer.seek(0)
+        if output is not None:
+            return None
         return buffer.getvalue()
     
-    def generate_receipt(self, sale_data: Dict) -> bytes:
+    def generate_receipt(self, sale_data: Dict, output: Optional[BinaryIO] = None) -> Optional[bytes]:
         """
         Generate customer receipt PDF.
         
         Args:
             sale_data: Sale information
+            output: Optional binary stream to write the PDF into
             
         Returns:
-            PDF bytes
+            PDF bytes, or None if written to `output`
         """
-        buffer = io.BytesIO()
+        buffer = output if output is not None else io.BytesIO()
         
         # Smaller page size for receipt
-        doc = SimpleDocTemplate(
-            buffer,
-            pagesize=(3.5*inch, 8*inch),  # Receipt size
-            rightMargin=10,
-            leftMargin=10,
-            topMargin=10,
-            bottomMargin=10
-        )
+        doc = SimpleDocTemplate(buffer, **_RECEIPT_DOC_KWARGS)
         
         story = []
         
         # Header
-        story.append(Paragraph("NANGULU CHICKEN FEED", 
-                              ParagraphStyle(name='ReceiptHeader', 
-                                           fontSize=16, 
-                                           alignment=TA_CENTER,
-                                           textColor=colors.HexColor('#2c3e50'),
-                                           spaceAfter=10)))
-        
-        story.append(Paragraph("POS Receipt", 
-                              ParagraphStyle(name='ReceiptSub', 
-                                           fontSize=12, 
-                                           alignment=TA_CENTER,
-                                           textColor=colors.grey,
-                                           spaceAfter=20)))
+        story.append(Paragraph("NANGULU CHICKEN FEED", self._receipt_styles['header']))
+        story.append(Paragraph("POS Receipt", self._receipt_styles['sub']))
         
         # Sale info
-        info_style = ParagraphStyle(name='ReceiptInfo', fontSize=10)
+        info_style = self._receipt_styles['info']
         
         info_text = f"""
         <b>Receipt #:</b> {sale_data.get('sale_number', '')}<br/>
@@ -381,11 +444,10 @@ class PDFReportGenerator:
         story.append(Spacer(1, 15))
         
         # Line items
-        story.append(Paragraph("=" * 40, 
-                              ParagraphStyle(name='Line', fontSize=8)))
+        story.append(self._receipt_separator())
         
         # Item details
-        item_style = ParagraphStyle(name='ItemStyle', fontSize=10)
+        item_style = self._receipt_styles['item']
         
         item_text = f"""
         <b>{sale_data.get('item_name', '')}</b><br/>
@@ -397,17 +459,16 @@ class PDFReportGenerator:
         story.append(Spacer(1, 10))
         
         # Total
-        story.append(Paragraph("=" * 40, 
-                              ParagraphStyle(name='Line', fontSize=8)))
+        story.append(self._receipt_separator())
         
-        total_style = ParagraphStyle(name='TotalStyle', fontSize=12, alignment=TA_RIGHT)
+        total_style = self._receipt_styles['total']
         total_text = f"TOTAL: <b>${sale_data.get('total_price', 0):.2f}</b>"
         story.append(Paragraph(total_text, total_style))
         
         story.append(Spacer(1, 20))
         
         # Footer note
-        footer_style = ParagraphStyle(name='FooterNote', fontSize=8, alignment=TA_CENTER)
+        footer_style = self._receipt_styles['footer']
         footer_text = """
         Thank you for your business!<br/>
         Returns require original receipt<br/>
@@ -418,8 +479,85 @@ class PDFReportGenerator:
         # Build PDF
         doc.build(story)
         
-        buffer.seek(0)
+        if output is not None:
+            return None
         return buffer.getvalue()
 
 # Create global instance
 pdf_generator = PDFReportGenerator()
+
+# Identical report requests (dashboard refresh, print retry) reuse the rendered PDF
+def _report_cache_key(report_fn: Callable, data: List[Dict], args: Tuple) -> Tuple:
+    """Cache key: report method, extra arguments and a digest of the report rows."""
+    digest = hashlib.blake2b(orjson.dumps(data, default=str), digest_size=16).digest()
+    return (report_fn.__qualname__, args, digest)
+
+# Reports with at least this many rows are rendered in a worker process.
+# ReportLab is pure Python and holds the GIL, so threads can't render in parallel.
+PROCESS_POOL_MIN_ROWS = 2000
+_process_pool: Optional[ProcessPoolExecutor] = None
+_process_pool_lock = threading.Lock()
+
+def _get_process_pool() -> ProcessPoolExecutor:
+    """
+    Create the report worker pool on first use.
+    Workers are spawned, not forked: the app process already runs threads
+    (audit writer, alert checks, the request threadpool) whose locks a
+    forked child could inherit held.
+    """
+    global _process_pool
+    with _process_pool_lock:
+        if _process_pool is None:
+            _process_pool = ProcessPoolExecutor(max_workers=min(4, os.cpu_count() or 1),
+                                                mp_context=multiprocessing.get_context("spawn"))
+        return _process_pool
+
+def _discard_process_pool(pool: ProcessPoolExecutor):
+    """Drop a broken pool so the next large report starts a fresh one."""
+    global _process_pool
+    with _process_pool_lock:
+        if _process_pool is pool:
+            _process_pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+def shutdown_process_pool():
+    """Stop the report worker pool, if it was started (app shutdown)."""
+    global _process_pool
+    with _process_pool_lock:
+        pool, _process_pool = _process_pool, None
+    if pool is not None:
+        pool.shutdown(wait=True, cancel_futures=True)
+
+def _render_in_worker(report_fn: Callable, data: List[Dict], *args) -> bytes:
+    """Worker-process entry point; uses the worker's own pdf_generator."""
+    return report_fn(pdf_generator, data, *args)
+
+def render_report(report_fn: Callable, data: List[Dict], *args) -> io.BytesIO:
+    """
+    Render a report into a buffer ready for streaming.
+    Reports rendered in the last REPORT_CACHE_TTL_SECONDS with identical rows
+    and arguments are served from the generator's LRU cache.
+    
+    Args:
+        report_fn: Unbound generator method, e.g. PDFReportGenerator.generate_sales_report
+        data: Report rows (stock_data / sales_data)
+        *args: Remaining positional arguments for report_fn
+        
+    Returns:
+        Buffer positioned at the start of the PDF
+    """
+    key = _report_cache_key(report_fn, data, args)
+    pdf_bytes = pdf_generator.get_cached_report(key)
+    if pdf_bytes is None:
+        if len(data) >= PROCESS_POOL_MIN_ROWS:
+            pool = _get_process_pool()
+            try:
+                pdf_bytes = pool.submit(_render_in_worker, report_fn, data, *args).result()
+            except BrokenProcessPool as e:
+                logger.error(f"Report worker pool broken, rendering in-thread: {e}")
+                _discard_process_pool(pool)
+        if pdf_bytes is None:
+            pdf_bytes = report_fn(pdf_generator, data, *args)
+        pdf_generator.cache_report(key, pdf_bytes)
+    
+    return io.BytesIO(pdf_bytes)
@@ -0,0 +1,20 @@
+-- Indexes declared in app/models.py (__table_args__).
+-- create_all only creates indexes together with new tables, so existing
+-- databases need these applied once. CONCURRENTLY avoids locking writes
+-- and cannot run inside a transaction block; run with psql in autocommit:
+--   psql "$DATABASE_URL" -f migrations/add_indexes.sql
+
+-- Alert/snapshot/archive filters on sales (created_at, status)
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_sales_created_status
+    ON sales (created_at, status);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_sales_active_created_at
+    ON sales (created_at)
+    WHERE status = 'ACTIVE';
+
+-- Per-item stock sums and ledger activity summaries
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_ledger_item_id
+    ON inventory_ledger (item_id);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_ledger_created_at
+    ON inventory_ledger (created_at);
@@ -2,9 +2,37 @@
 """
 Test all dependencies for Render compatibility
 """
+import re
 import sys
 import subprocess
-import pkg_resources
+import importlib.metadata
+
+try:
+    from packaging.version import parse as parse_version
+except ImportError:
+    # packaging isn't a runtime dependency; compare numeric release parts instead
+    def parse_version(version):
+        """Numeric release tuple, e.g. "2.0.25" -> (2, 0, 25), "1.0rc1" -> (1, 0)"""
+        parts = []
+        for part in version.split("."):
+            digits = re.match(r"\d+", part)
+            if digits is None:
+                break
+            parts.append(int(digits.group()))
+            if digits.end() != len(part):
+                break
+        return tuple(parts)
+
+def _normalize(name):
+    """Normalize a distribution name (PEP 503) for lookup"""
+    return name.lower().replace("_", "-").replace(".", "-")
+
+# Scan installed distributions once instead of once per package
+INSTALLED_VERSIONS = {
+    _normalize(dist.metadata["Name"]): dist.version
+    for dist in importlib.metadata.distributions()
+    if dist.metadata["Name"]
+}
 
 def test_import(package_name, import_name=None):
     """Test if a package can be imported"""
@@ -17,16 +45,18 @@ def test_import(package_name, import_name=None):
 
 def check_package_version(package_name, min_version=None):
     """Check if package is installed and meets version requirement"""
-    try:
-        version = pkg_resources.get_distribution(package_name).version
-        if min_version:
-            if pkg_resources.parse_version(version) >= pkg_resources.parse_version(min_version):
-                return True, f"✅ {package_name}=={version} (>= {min_version})"
-            else:
-                return False, f"⚠️ {package_name}=={version} (needs >= {min_version})"
-        return True, f"✅ {package_name}=={version}"
-    except pkg_resources.DistributionNotFound:
-        return False, f"❌ {package_name} not installed"
+    version = INSTALLED_VERSIONS.get(_normalize(package_name))
+    if version is None:
+        try:
+            version = importlib.metadata.version(package_name)
+        except importlib.metadata.PackageNotFoundError:
+            return False, f"❌ {package_name} not installed"
+    if min_version:
+        if parse_version(version) >= parse_version(min_version):
+            return True, f"✅ {package_name}=={version} (>= {min_version})"
+        else:
+            return False, f"⚠️ {package_name}=={version} (needs >= {min_version})"
+    return True, f"✅ {package_name}=={version}"
 
 def main():
     print("🔍 Testing Nangulu POS Dependencies for Render...")
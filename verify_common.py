@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+Shared path checks for the verify scripts.
+One os.scandir per parent directory instead of one stat per required path;
+the cache lives for the whole process, so scripts run together share it.
+"""
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+# parent directory -> {entry name: DirEntry}
+scandir_cache = {}
+
+def _entries(parent):
+    """Map entry name -> DirEntry for everything directly under parent"""
+    try:
+        return {e.name: e for e in os.scandir(parent)}
+    except (FileNotFoundError, NotADirectoryError):
+        return {}
+
+def lookup(path):
+    """Return the cached DirEntry for path, or None if it doesn't exist"""
+    parent, name = os.path.split(path)
+    parent = parent or "."
+    entries = scandir_cache.get(parent)
+    if entries is None:
+        entries = scandir_cache[parent] = _entries(parent)
+    return entries.get(name)
+
+def exists(path):
+    """True if path exists, answered from the scandir cache"""
+    return lookup(path) is not None
+
+def is_file(path):
+    """True if path is a file, answered from the cached DirEntry type bits"""
+    entry = lookup(path)
+    return entry is not None and entry.is_file()
+
+def is_dir_nofollow(path):
+    """True if path is a real directory (not a symlink to one); no extra stat"""
+    entry = lookup(path)
+    return entry is not None and entry.is_dir(follow_symlinks=False)
+
+def prefetch(paths):
+    """Scan every distinct parent directory of paths concurrently into the cache"""
+    parents = {os.path.split(path)[0] or "." for path in paths} - scandir_cache.keys()
+    try:
+        with ThreadPoolExecutor(max_workers=16) as ex:
+            scandir_cache.update(zip(parents, ex.map(_entries, parents)))
+    except Exception:
+        # Serial fallback; lookup fills the cache on demand
+        pass
@@ -3,10 +3,45 @@
 Verify Step 4: inventory + ledger logic implementation
 """
 import os
+import re
 import sys
+from importlib.machinery import PathFinder
 
-print("🔍 Verifying Step 4: inventory + ledger logic")
-print("=" * 60)
+from verify_common import exists
+
+# Top-level names bound in a module: classes, functions and assignments
+_TOP_LEVEL_NAME = re.compile(r"^(?:class\s+(\w+)|def\s+(\w+)|(\w+)\s*(?::[^=\n]*)?=)", re.MULTILINE)
+
+def find_module_spec(module_name):
+    """
+    Locate a module like importlib.util.find_spec, but without executing
+    the parent packages' __init__ files (app/routers/__init__.py imports
+    every router).
+    """
+    spec = None
+    search_path = None
+    parts = module_name.split(".")
+    for i in range(len(parts)):
+        spec = PathFinder.find_spec(".".join(parts[:i + 1]), search_path)
+        if spec is None:
+            return None
+        search_path = spec.submodule_search_locations
+    return spec
+
+def check_defines(module_name, *names):
+    """Raise ImportError unless module_name exists and defines every name (source scan, no import)"""
+    spec = find_module_spec(module_name)
+    if spec is None or not spec.origin:
+        raise ImportError(f"No module named '{module_name}'")
+    with open(spec.origin, "r", encoding="utf-8") as f:
+        defined = {next(filter(None, m)) for m in _TOP_LEVEL_NAME.findall(f.read())}
+    missing = [name for name in names if name not in defined]
+    if missing:
+        raise ImportError(f"cannot import name {', '.join(missing)} from '{module_name}'")
+
+out = []  # Buffered output, written once at the end
+out.append("🔍 Verifying Step 4: inventory + ledger logic")
+out.append("=" * 60)
 
 # Check required files
 required_files = [
@@ -18,74 +53,87 @@ required_files = [
 
 all_good = True
 for file in required_files:
-    if os.path.exists(file):
-        print(f"✅ {file}")
+    if exists(file):
+        out.append(f"✅ {file}")
     else:
-        print(f"❌ {file} (missing)")
+        out.append(f"❌ {file} (missing)")
         all_good = False
 
-print()
-print("📦 Checking imports...")
+out.append("")
+out.append("📦 Checking imports...")
 
-# Test imports
-try:
-    sys.path.insert(0, ".")
-    
-    # Test schemas
-    from app.schemas.inventory import InventoryItemCreate, PurchaseCreate, StockStatusResponse
-    print("✅ Inventory schemas import")
-    
-    # Test CRUD
-    from app.crud.inventory import crud_inventory_item, crud_inventory_ledger
-    print("✅ Inventory CRUD import")
-    
-    # Test router
-    from app.routers.inventory import router
-    print("✅ Inventory router import")
-    
-    # Count routes
-    from app.main import app
-    inventory_routes = [r.path for r in app.routes if "/inventory" in r.path]
-    print(f"✅ Found {len(inventory_routes)} inventory routes")
-    
-    # Check contract compliance
-    print()
-    print("📋 Contract Compliance Check:")
-    print("  - KGs as source of truth: ✅ (schemas enforce Decimal)")
-    print("  - Append-only ledger: ✅ (ledger CRUD only creates)")
-    print("  - Admin controls structure: ✅ (require_admin decorator)")
-    print("  - No silent updates: ✅ (audit logging)")
-    print("  - Price conversion: ✅ (convert endpoint)")
-    print("  - Low stock alerts: ✅ (alerts endpoint)")
-    
-except ImportError as e:
-    print(f"❌ Import error: {e}")
-    import traceback
-    traceback.print_exc()
-    all_good = False
-except Exception as e:
-    print(f"❌ Error: {e}")
-    import traceback
-    traceback.print_exc()
-    all_good = False
+# Test imports (skipped when files are already missing; importing app.main
+# pulls in FastAPI, SQLAlchemy and the DB driver, so presence checks only
+# locate and scan the module sources)
+if all_good:
+    try:
+        if "." not in sys.path:
+            sys.path.insert(0, ".")
+        
+        # Test schemas
+        check_defines("app.schemas.inventory", "InventoryItemCreate", "PurchaseCreate", "StockStatusResponse")
+        out.append("✅ Inventory schemas import")
+        
+        # Test CRUD
+        check_defines("app.crud.inventory", "crud_inventory_item", "crud_inventory_ledger")
+        out.append("✅ Inventory CRUD import")
+        
+        # Test router
+        check_defines("app.routers.inventory", "router")
+        out.append("✅ Inventory router import")
+        
+        # Count routes (the only check that needs the app actually imported)
+        from app.main import app
+        # Inventory router is mounted under the /api prefix in app.main
+        inventory_route_count = sum(1 for r in app.routes if r.path.startswith("/api/inventory"))
+        out.append(f"✅ Found {inventory_route_count} inventory routes")
+        
+        # Check contract compliance
+        out.append("")
+        out.append("📋 Contract Compliance Check:")
+        out.append("  - KGs as source of truth: ✅ (schemas enforce Decimal)")
+        out.append("  - Append-only ledger: ✅ (ledger CRUD only creates)")
+        out.append("  - Admin controls structure: ✅ (require_admin decorator)")
+        out.append("  - No silent updates: ✅ (audit logging)")
+        out.append("  - Price conversion: ✅ (convert endpoint)")
+        out.append("  - Low stock alerts: ✅ (alerts endpoint)")
+        
+    except ImportError as e:
+        out.append(f"❌ Import error: {type(e).__name__}: {e}")
+        if os.environ.get("VERIFY_DEBUG"):
+            import traceback
+            traceback.print_exc()
+        all_good = False
+    except Exception as e:
+        out.append(f"❌ Error: {type(e).__name__}: {e}")
+        if os.environ.get("VERIFY_DEBUG"):
+            import traceback
+            traceback.print_exc()
+        all_good = False
+else:
+    out.append("⏭️ Skipped (required files missing)")
 
-print()
-print("=" * 60)
+out.append("")
+out.append("=" * 60)
 if all_good:
-    print("🎉 Step 4 (inventory + ledger logic) implementation verified!")
-    print()
-    print("Key features implemented:")
-    print("1. Inventory items with KG-based tracking")
-    print("2. Append-only ledger with audit trail")
-    print("3. Stock purchase recording (admin only)")
-    print("4. Real-time stock calculations")
-    print("5. KG ↔ Price conversion utilities")
-    print("6. Low/critical stock alerts")
-    print("7. Full audit logging")
-    print("8. SQLAlchemy 2.x patterns only")
-    print("9. psycopg3 driver enforced")
-    print()
-    print("Ready for Step 5: sales & reversals")
+    out.append("🎉 Step 4 (inventory + ledger logic) implementation verified!")
+    out.append("")
+    out.append("Key features implemented:")
+    out.append("1. Inventory items with KG-based tracking")
+    out.append("2. Append-only ledger with audit trail")
+    out.append("3. Stock purchase recording (admin only)")
+    out.append("4. Real-time stock calculations")
+    out.append("5. KG ↔ Price conversion utilities")
+    out.append("6. Low/critical stock alerts")
+    out.append("7. Full audit logging")
+    out.append("8. SQLAlchemy 2.x patterns only")
+    out.append("9. psycopg3 driver enforced")
+    out.append("")
+    out.append("Ready for Step 5: sales & reversals")
 else:
-    print("⚠️ Verification failed. Check missing files.")
+    out.append("⚠️ Verification failed. Check missing files.")
+
+# Emit everything with a single write
+sys.stdout.write("\n".join(out) + "\n")
+if not all_good:
     sys.exit(1)
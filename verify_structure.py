@@ -2,9 +2,11 @@
 """
 Verify project structure matches README contract
 """
-import os
+import re
 import sys
 
+from verify_common import is_dir_nofollow, is_file, prefetch
+
 REQUIRED_FILES = [
     "requirements.txt",
     "runtime.txt",
@@ -35,83 +37,101 @@ REQUIRED_DIRS = [
     "templates",
 ]
 
+_REQUIREMENT_NAME = re.compile(r"[<>=!~ \[;#]")
+
+def _read_text(path):
+    """Return the file's contents, or None if it doesn't exist (no stat first)"""
+    try:
+        with open(path, "r") as f:
+            return f.read()
+    except FileNotFoundError:
+        return None
+
 def check_file_exists(path):
-    if os.path.exists(path):
+    if is_file(path):
         return True, f"✅ {path}"
     else:
         return False, f"❌ {path} (missing)"
 
 def check_directory_exists(path):
-    if os.path.isdir(path):
+    if is_dir_nofollow(path):
         return True, f"✅ {path}/"
     else:
         return False, f"❌ {path}/ (missing)"
 
 def main():
-    print("🔍 Verifying Nangulu POS Structure...")
-    print("=" * 60)
+    out = []  # Buffered output, written once at the end
+    out.append("🔍 Verifying Nangulu POS Structure...")
+    out.append("=" * 60)
     
     all_passed = True
+    prefetch(REQUIRED_DIRS + REQUIRED_FILES)
     
-    print("\n📁 Directory Structure:")
+    out.append("\n📁 Directory Structure:")
     for directory in REQUIRED_DIRS:
         passed, message = check_directory_exists(directory)
-        print(f"  {message}")
+        out.append(f"  {message}")
         if not passed:
             all_passed = False
     
-    print("\n📄 Required Files:")
+    out.append("\n📄 Required Files:")
     for file in REQUIRED_FILES:
         passed, message = check_file_exists(file)
-        print(f"  {message}")
+        out.append(f"  {message}")
         if not passed:
             all_passed = False
     
     # Check requirements.txt content
-    print("\n📦 requirements.txt check:")
-    if os.path.exists("requirements.txt"):
-        with open("requirements.txt", "r") as f:
-            content = f.read()
-            lines = [line.strip() for line in content.split('\n') if line.strip()]
-            print(f"  Found {len(lines)} dependencies")
-            
-            # Check for critical packages
-            critical = ["fastapi", "sqlalchemy", "psycopg2", "pydantic"]
-            for package in critical:
-                if any(package in line.lower() for line in lines):
-                    print(f"  ✅ {package} in requirements.txt")
-                else:
-                    print(f"  ❌ {package} missing from requirements.txt")
-                    all_passed = False
+    out.append("\n📦 requirements.txt check:")
+    content = _read_text("requirements.txt")
+    if content is not None:
+        lines = [line for line in map(str.strip, content.splitlines()) if line]
+        out.append(f"  Found {len(lines)} dependencies")
+        
+        # Package names, parsed once (drop extras, version specifiers and comments)
+        tokens = {_REQUIREMENT_NAME.split(line.lower(), 1)[0] for line in lines}
+        
+        # Check for critical packages
+        critical = ["fastapi", "sqlalchemy", "psycopg", "pydantic"]
+        for package in critical:
+            if package in tokens:
+                out.append(f"  ✅ {package} in requirements.txt")
+            else:
+                out.append(f"  ❌ {package} missing from requirements.txt")
+                all_passed = False
     else:
-        print("  ❌ requirements.txt not found")
+        out.append("  ❌ requirements.txt not found")
         all_passed = False
     
     # Check runtime.txt
-    print("\n🐍 runtime.txt check:")
-    if os.path.exists("runtime.txt"):
-        with open("runtime.txt", "r") as f:
-            version = f.read().strip()
-            if "3.11" in version:
-                print(f"  ✅ Python 3.11 specified: {version}")
-            else:
-                print(f"  ⚠️ Not Python 3.11: {version}")
-                print("  Note: Python 3.11 has best wheel support for Render")
+    out.append("\n🐍 runtime.txt check:")
+    version = _read_text("runtime.txt")
+    if version is not None:
+        version = version.strip()
+        if version.startswith("python-3.11"):
+            out.append(f"  ✅ Python 3.11 specified: {version}")
+        else:
+            out.append(f"  ⚠️ Not Python 3.11: {version}")
+            out.append("  Note: Python 3.11 has best wheel support for Render")
     else:
-        print("  ⚠️ runtime.txt not found (optional but recommended)")
+        out.append("  ⚠️ runtime.txt not found (optional but recommended)")
     
-    print("\n" + "=" * 60)
+    out.append("\n" + "=" * 60)
     if all_passed:
-        print("🎉 Structure verification complete! All checks passed.")
-        print("\nTo test the application locally:")
-        print("  ./setup.sh  # Install dependencies")
-        print("  ./run.sh    # Start the server")
-        print("\nTo deploy to Render:")
-        print("  1. Push to GitHub")
-        print("  2. Connect repository in Render dashboard")
-        print("  3. Render will use render.yaml automatically")
+        out.append("🎉 Structure verification complete! All checks passed.")
+        out.append("\nTo test the application locally:")
+        out.append("  ./setup.sh  # Install dependencies")
+        out.append("  ./run.sh    # Start the server")
+        out.append("\nTo deploy to Render:")
+        out.append("  1. Push to GitHub")
+        out.append("  2. Connect repository in Render dashboard")
+        out.append("  3. Render will use render.yaml automatically")
     else:
-        print("⚠️ Structure verification failed. Missing required files/directories.")
+        out.append("⚠️ Structure verification failed. Missing required files/directories.")
+    
+    # Emit everything with a single write
+    sys.stdout.write("\n".join(out) + "\n")
+    if not all_passed:
         sys.exit(1)
 
 if __name__ == "__main__":